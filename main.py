@@ -1,155 +1,485 @@
+import asyncio
+import copy
+import gzip
+import hashlib
 import os
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+import orjson
+from cachetools import TTLCache
+from fastapi import Body, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from pydantic.json_schema import models_json_schema
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Receive, Scope, Send
 
-from schemas import MenuItem, Review, Order
+from schemas import MenuItem, Review, Order, slugify
 
-app = FastAPI(title="Flame & Wrap Co. API", version="1.0.0")
+# Resolve the database module once at import rather than on every request
+try:
+    from pymongo import WriteConcern
+    from database import async_db as db
+    DATABASE_MODULE_FOUND = True
+except ImportError:
+    db = None
+    DATABASE_MODULE_FOUND = False
+
+
+# Demo mode only: with ORDERS_FIRE_AND_FORGET=1 orders are written
+# unacknowledged (w=0), so the handler returns once the insert has been sent
+# instead of waiting a Mongo round-trip. Failed writes then go unnoticed, so
+# acknowledged writes remain the default.
+ORDERS_FIRE_AND_FORGET = os.getenv("ORDERS_FIRE_AND_FORGET") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker setup and teardown of the Motor-backed resources"""
+    if db is None:
+        app.state.orders = None
+    elif ORDERS_FIRE_AND_FORGET:
+        app.state.orders = db.get_collection("order", write_concern=WriteConcern(w=0))
+    else:
+        app.state.orders = db.get_collection("order")
+    yield
+    if db is not None:
+        db.client.close()
+
+
+app = FastAPI(
+    title="Flame & Wrap Co. API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Explicit allowlists let CORSMiddleware use its precomputed header sets
+# instead of echoing request headers back on every call.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "https://flameandwrap.co").split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type"],
+)
+
+
+def _accepts_gzip(headers: Headers) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (q=0 refuses)"""
+    qualities: Dict[str, float] = {}
+    for part in headers.get("accept-encoding", "").split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+
+class QValueGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that respects q=0 in Accept-Encoding
+
+    Starlette only checks for the substring "gzip", so "gzip;q=0" (an explicit
+    refusal) would still get a compressed body.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and _accepts_gzip(Headers(scope=scope)):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+# Responses that already carry a Content-Encoding (e.g. /schema) pass through
+app.add_middleware(QValueGZipMiddleware, minimum_size=512, compresslevel=5)
+
+
+# Invariants computed once at import instead of on every request
+# All app schemas are generated in one pass so shared sub-models such as
+# OrderItem are walked once, then each model gets back the "$defs" it
+# references so every entry stays a standalone JSON Schema.
+_, _SCHEMA_DOC = models_json_schema(
+    [(MenuItem, "validation"), (Review, "validation"), (Order, "validation")]
 )
+_SCHEMA_DEFS = _SCHEMA_DOC["$defs"]
+
+
+def _collect_refs(node, found: Dict[str, dict]) -> None:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            name = ref[len("#/$defs/"):]
+            if name not in found:
+                found[name] = _SCHEMA_DEFS[name]
+                _collect_refs(found[name], found)
+        for value in node.values():
+            _collect_refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, found)
+
+
+def _standalone_schema(name: str) -> dict:
+    schema = _SCHEMA_DEFS[name]
+    defs: Dict[str, dict] = {}
+    _collect_refs(schema, defs)
+    return {"$defs": defs, **schema} if defs else schema
+
+
+MENU_SCHEMA = _standalone_schema("MenuItem")
+REVIEW_SCHEMA = _standalone_schema("Review")
+ORDER_SCHEMA = _standalone_schema("Order")
+SCHEMA_RESPONSE = {
+    "menuitem": MENU_SCHEMA,
+    "review": REVIEW_SCHEMA,
+    "order": ORDER_SCHEMA,
+}
+
+DEFAULT_MENU_ITEMS: List[MenuItem] = [
+    MenuItem(
+        name="City Classic Shawarma",
+        description="Fire-grilled chicken, garlic sauce, pickles, city herbs.",
+        price=11.95,
+        category="wraps",
+        image="https://images.unsplash.com/photo-1604908554039-955f8a19a34b?q=80&w=1200&auto=format&fit=crop",
+        media="https://cdn.coverr.co/videos/coverr-grilling-meat-2869/1080p.mp4",
+        rating=4.9,
+        ratings_count=542,
+    ),
+    MenuItem(
+        name="Ember Beef Skewers",
+        description="Charred edges, tender center, pomegranate glaze.",
+        price=14.5,
+        category="skewers",
+        image="https://images.unsplash.com/photo-1616712134411-6a2dd1d8ef2e?q=80&w=1200&auto=format&fit=crop",
+        media="https://cdn.coverr.co/videos/coverr-fire-grilling-4037/1080p.mp4",
+        rating=4.8,
+        ratings_count=311,
+    ),
+    MenuItem(
+        name="Loaded City Fries",
+        description="Garlic drizzle, chili crunch, parsley rain.",
+        price=8.75,
+        category="fries",
+        image="https://images.unsplash.com/photo-1546549039-49d3c2d6d3d2?q=80&w=1200&auto=format&fit=crop",
+        media="https://cdn.coverr.co/videos/coverr-close-up-of-french-fries-1550/1080p.mp4",
+        rating=4.7,
+        ratings_count=228,
+    ),
+]
+
+DEFAULT_REVIEWS: List[Review] = [
+    Review(name="Layla", rating=5, quote="The garlic drizzle is unreal. City vibes in a wrap!", platform="Google"),
+    Review(name="Marco", rating=5, quote="Beef skewers with that ember glaze… perfection.", platform="Yelp"),
+    Review(name="Anaya", rating=4, quote="Loaded fries that belong in a music video.", platform="Google"),
+]
+
+# Seed documents, dumped once. Never hand these to the driver directly:
+# insert_many writes "_id" into every document it is given.
+DEFAULT_MENU_DUMP = [m.model_dump(mode="python", by_alias=False) for m in DEFAULT_MENU_ITEMS]
+DEFAULT_REVIEW_DUMP = [r.model_dump(mode="python", by_alias=False) for r in DEFAULT_REVIEWS]
+
+# Menu documents keyed by item ID, used to price incoming orders without a DB
+# round-trip. Rebuilt whenever the menu loader refreshes the cache.
+MENU_BY_ID: Dict[str, dict] = {d["id"]: d for d in DEFAULT_MENU_DUMP}
+# Whether MENU_BY_ID reflects the configured database. Without a database the
+# defaults are the real menu; with one, only a successful load counts.
+MENU_INDEX_LOADED = db is None
+
+
+class Payload(NamedTuple):
+    """An encoded JSON body and its strong ETag, always replaced together"""
+    body: bytes
+    etag: str
+
+
+def _payload(body: bytes) -> Payload:
+    return Payload(body, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match against our ETag (weak comparison, RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _json_response(request: Request, payload: Payload, headers: Optional[Dict[str, str]] = None) -> Response:
+    # GZipMiddleware may re-encode this body, which changes its bytes but not
+    # its meaning, so the validator is advertised as weak
+    etag = "W/" + payload.etag
+    headers = {**(headers or {}), "ETag": etag}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+# Fully static bodies are encoded once at import and served as raw bytes.
+# Under gunicorn --preload this runs in the master before it forks, so the
+# immutable bytes are shared copy-on-write by every worker.
+ROOT_BYTES = orjson.dumps({"message": "Flame & Wrap Co. backend running"})
+HELLO_BYTES = orjson.dumps({"message": "Hello from the backend API!"})
+SCHEMA_BYTES = orjson.dumps(SCHEMA_RESPONSE)
+SCHEMA_GZIP_BYTES = gzip.compress(SCHEMA_BYTES, compresslevel=9)
+DEFAULT_MENU_BYTES = orjson.dumps(DEFAULT_MENU_DUMP)
+DEFAULT_REVIEW_BYTES = orjson.dumps(DEFAULT_REVIEW_DUMP)
+SCHEMA_PAYLOAD = _payload(SCHEMA_BYTES)
+# The pre-compressed representation is a different byte sequence, so it gets
+# its own strong validator
+SCHEMA_GZIP_ETAG = SCHEMA_PAYLOAD.etag[:-1] + '-gzip"'
+DEFAULT_MENU_PAYLOAD = _payload(DEFAULT_MENU_BYTES)
+DEFAULT_REVIEW_PAYLOAD = _payload(DEFAULT_REVIEW_BYTES)
+
+# Documents read back from Mongo were written by this app and are returned as
+# is. Set VALIDATE_RESPONSES=1 (e.g. in CI) to run them through Pydantic first.
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES") == "1"
+
+
+class SingleFlight:
+    """Coalesce concurrent calls into one in-flight task whose result all share
+
+    Checking and starting the task happens without an await in between, so on
+    a single event loop no lock is needed for the check-then-start.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    async def do(self, fn: Callable[[], Awaitable[Payload]]) -> Payload:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(fn())
+        # Shielded so a disconnecting client cannot cancel the shared load
+        return await asyncio.shield(self._task)
+
+
+# Per-process TTL caches holding the encoded list payloads. Each has its own
+# SingleFlight so concurrent misses share a single Mongo query.
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 60))
+_menu_cache: TTLCache = TTLCache(maxsize=1, ttl=CACHE_TTL_SECONDS)
+_review_cache: TTLCache = TTLCache(maxsize=1, ttl=CACHE_TTL_SECONDS)
+_menu_flight = SingleFlight()
+_review_flight = SingleFlight()
+
+
+async def _cached(cache: TTLCache, flight: SingleFlight, loader: Callable[[], Awaitable[bytes]]) -> Payload:
+    """Return the cached payload, running the loader once per expiry window"""
+    payload = cache.get("payload")
+    if payload is not None:
+        return payload
+
+    async def refresh() -> Payload:
+        payload = _payload(await loader())
+        cache["payload"] = payload
+        return payload
+
+    return await flight.do(refresh)
+
+
+async def _seed(collection, dumps: List[dict]) -> None:
+    """Insert copies of the precomputed seed documents into an empty collection"""
+    await collection.insert_many(copy.deepcopy(dumps))
+
+
+def _menu_key(doc: dict) -> str:
+    # Documents seeded before items had IDs fall back to the slugified name
+    return doc.get("id") or slugify(doc["name"])
+
+
+async def _fetch_docs(collection, model) -> List[dict]:
+    docs = await collection.find({}, {"_id": 0}).to_list(length=None)
+    if VALIDATE_RESPONSES:
+        docs = [model(**doc).model_dump() for doc in docs]
+    return docs
+
+
+async def _load_menu() -> bytes:
+    global MENU_BY_ID, MENU_INDEX_LOADED
+    if db is None:
+        return DEFAULT_MENU_BYTES
+    docs = await _fetch_docs(db["menuitem"], MenuItem)
+    if not docs:
+        # Seed defaults if collection empty
+        await _seed(db["menuitem"], DEFAULT_MENU_DUMP)
+        MENU_BY_ID = {d["id"]: d for d in DEFAULT_MENU_DUMP}
+        MENU_INDEX_LOADED = True
+        return DEFAULT_MENU_BYTES
+    for doc in docs:
+        # Serve the same ID that create_order will look the item up by
+        doc["id"] = _menu_key(doc)
+    MENU_BY_ID = {doc["id"]: doc for doc in docs}
+    MENU_INDEX_LOADED = True
+    return orjson.dumps(docs)
+
+
+async def _load_reviews() -> bytes:
+    if db is None:
+        return DEFAULT_REVIEW_BYTES
+    docs = await _fetch_docs(db["review"], Review)
+    if not docs:
+        await _seed(db["review"], DEFAULT_REVIEW_DUMP)
+        return DEFAULT_REVIEW_BYTES
+    return orjson.dumps(docs)
 
 
 @app.get("/")
-def read_root():
-    return {"message": "Flame & Wrap Co. backend running"}
+async def read_root():
+    return Response(content=ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/api/hello")
-def hello():
-    return {"message": "Hello from the backend API!"}
+async def hello():
+    return Response(content=HELLO_BYTES, media_type="application/json")
+
+
+# Everything /test reports except the live collection listing is fixed for the
+# life of the process, so the response template is built once.
+_DATABASE_URL_SET = bool(os.getenv("DATABASE_URL"))
+_DATABASE_NAME_SET = bool(os.getenv("DATABASE_NAME"))
+
+if not DATABASE_MODULE_FOUND:
+    _database_status = "❌ Database module not found (run enable-database first)"
+elif db is not None:
+    _database_status = "✅ Available"
+else:
+    _database_status = "⚠️  Available but not initialized"
+
+TEST_RESPONSE_TEMPLATE = {
+    "backend": "✅ Running",
+    "database": _database_status,
+    "database_url": "✅ Set" if _DATABASE_URL_SET else "❌ Not Set",
+    "database_name": "✅ Set" if _DATABASE_NAME_SET else "❌ Not Set",
+    "connection_status": "Connected" if db is not None else "Not Connected",
+    "collections": [],
+}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
-    response = {
-        "backend": "✅ Running",
-        "database": "❌ Not Available",
-        "database_url": None,
-        "database_name": None,
-        "connection_status": "Not Connected",
-        "collections": []
-    }
+    if db is None:
+        return TEST_RESPONSE_TEMPLATE
 
     try:
-        from database import db
-
-        if db is not None:
-            response["database"] = "✅ Available"
-            response["database_url"] = "✅ Configured"
-            response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
-            response["connection_status"] = "Connected"
-
-            try:
-                collections = db.list_collection_names()
-                response["collections"] = collections[:10]
-                response["database"] = "✅ Connected & Working"
-            except Exception as e:
-                response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
-        else:
-            response["database"] = "⚠️  Available but not initialized"
-
-    except ImportError:
-        response["database"] = "❌ Database module not found (run enable-database first)"
+        collections = await db.list_collection_names()
+        return {
+            **TEST_RESPONSE_TEMPLATE,
+            "database": "✅ Connected & Working",
+            "collections": collections[:10],
+        }
     except Exception as e:
-        response["database"] = f"❌ Error: {str(e)[:50]}"
-
-    import os
-    response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
-
-    return response
+        return {**TEST_RESPONSE_TEMPLATE, "database": f"⚠️  Connected but Error: {str(e)[:50]}"}
 
 
 @app.get("/schema")
-def get_schema():
+async def get_schema(request: Request):
     """Expose app schemas for tooling/inspection."""
-    return {
-        "menuitem": MenuItem.model_json_schema(),
-        "review": Review.model_json_schema(),
-        "order": Order.model_json_schema(),
-    }
+    if _accepts_gzip(request.headers):
+        body, etag, headers = SCHEMA_GZIP_BYTES, SCHEMA_GZIP_ETAG, {"Content-Encoding": "gzip"}
+    else:
+        body, etag, headers = SCHEMA_BYTES, SCHEMA_PAYLOAD.etag, {}
+    headers.update({"Vary": "Accept-Encoding", "ETag": etag})
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # -------- App Endpoints --------
 
-@app.get("/api/menu", response_model=List[MenuItem])
-def get_menu():
-    """Return signature menu items. Uses DB if configured, else returns curated defaults."""
-    defaults: List[MenuItem] = [
-        MenuItem(
-            name="City Classic Shawarma",
-            description="Fire-grilled chicken, garlic sauce, pickles, city herbs.",
-            price=11.95,
-            category="wraps",
-            image="https://images.unsplash.com/photo-1604908554039-955f8a19a34b?q=80&w=1200&auto=format&fit=crop",
-            media="https://cdn.coverr.co/videos/coverr-grilling-meat-2869/1080p.mp4",
-            rating=4.9,
-            ratings_count=542,
-        ),
-        MenuItem(
-            name="Ember Beef Skewers",
-            description="Charred edges, tender center, pomegranate glaze.",
-            price=14.5,
-            category="skewers",
-            image="https://images.unsplash.com/photo-1616712134411-6a2dd1d8ef2e?q=80&w=1200&auto=format&fit=crop",
-            media="https://cdn.coverr.co/videos/coverr-fire-grilling-4037/1080p.mp4",
-            rating=4.8,
-            ratings_count=311,
-        ),
-        MenuItem(
-            name="Loaded City Fries",
-            description="Garlic drizzle, chili crunch, parsley rain.",
-            price=8.75,
-            category="fries",
-            image="https://images.unsplash.com/photo-1546549039-49d3c2d6d3d2?q=80&w=1200&auto=format&fit=crop",
-            media="https://cdn.coverr.co/videos/coverr-close-up-of-french-fries-1550/1080p.mp4",
-            rating=4.7,
-            ratings_count=228,
-        ),
-    ]
-
+async def _menu_payload() -> Payload:
+    if db is None:
+        return DEFAULT_MENU_PAYLOAD
     try:
-        from database import db
-        if db is None:
-            return defaults
-        docs = list(db["menuitem"].find({}, {"_id": 0}))
-        if not docs:
-            # Seed defaults if collection empty
-            db["menuitem"].insert_many([d.model_dump() for d in defaults])
-            return defaults
-        # Validate via Pydantic
-        return [MenuItem(**doc) for doc in docs]
+        return await _cached(_menu_cache, _menu_flight, _load_menu)
     except Exception:
-        return defaults
+        # Serve defaults without caching them so the next request retries the DB
+        return DEFAULT_MENU_PAYLOAD
 
 
-@app.get("/api/reviews", response_model=List[Review])
-def get_reviews():
-    defaults: List[Review] = [
-        Review(name="Layla", rating=5, quote="The garlic drizzle is unreal. City vibes in a wrap!", platform="Google"),
-        Review(name="Marco", rating=5, quote="Beef skewers with that ember glaze… perfection.", platform="Yelp"),
-        Review(name="Anaya", rating=4, quote="Loaded fries that belong in a music video.", platform="Google"),
-    ]
+async def _reviews_payload() -> Payload:
+    if db is None:
+        return DEFAULT_REVIEW_PAYLOAD
     try:
-        from database import db
-        if db is None:
-            return defaults
-        docs = list(db["review"].find({}, {"_id": 0}))
-        if not docs:
-            db["review"].insert_many([d.model_dump() for d in defaults])
-            return defaults
-        return [Review(**doc) for doc in docs]
+        return await _cached(_review_cache, _review_flight, _load_reviews)
     except Exception:
-        return defaults
+        return DEFAULT_REVIEW_PAYLOAD
+
+
+async def _schema_payload() -> Payload:
+    return SCHEMA_PAYLOAD
+
+
+@app.get("/api/menu")
+async def get_menu(request: Request):
+    """Return signature menu items. Uses DB if configured, else returns curated defaults."""
+    return _json_response(request, await _menu_payload())
+
+
+@app.get("/api/reviews")
+async def get_reviews(request: Request):
+    return _json_response(request, await _reviews_payload())
+
+
+# Resources that can be fetched together through /api/batch
+BATCH_LOADERS: Dict[str, Callable[[], Awaitable[Payload]]] = {
+    "menu": _menu_payload,
+    "reviews": _reviews_payload,
+    "schema": _schema_payload,
+}
+
+
+async def _batch_item(name: str) -> bytes:
+    loader = BATCH_LOADERS.get(name)
+    if loader is None:
+        raise ValueError(f"Unknown resource: {name}")
+    return (await loader()).body
+
+
+@app.post("/api/batch")
+async def batch(resources: List[str] = Body(..., examples=[["menu", "reviews", "schema"]])):
+    """Fetch several read endpoints in one round-trip, keyed by resource name."""
+    names = list(dict.fromkeys(resources))
+    results = await asyncio.gather(*(_batch_item(name) for name in names), return_exceptions=True)
+    # Each payload is already encoded JSON, so splice the bytes together
+    # rather than decoding and re-encoding them. Failures stay in their slot.
+    parts = [
+        orjson.dumps(name) + b":" + (
+            result if isinstance(result, bytes) else orjson.dumps({"error": str(result)})
+        )
+        for name, result in zip(names, results)
+    ]
+    return Response(content=b"{" + b",".join(parts) + b"}", media_type="application/json")
+
+
+# Lines that match no menu item (e.g. configurator builds) are only accepted,
+# at the client's price, when ALLOW_CUSTOM_ITEMS=1
+ALLOW_CUSTOM_ITEMS = os.getenv("ALLOW_CUSTOM_ITEMS") == "1"
+
+# Sales tax rate applied server-side to order subtotals, e.g. 0.0875
+TAX_RATE: Optional[float] = float(os.environ["TAX_RATE"]) if os.getenv("TAX_RATE") else None
 
 
 class OrderResponse(BaseModel):
@@ -158,11 +488,51 @@ class OrderResponse(BaseModel):
 
 
 @app.post("/api/orders", response_model=OrderResponse)
-def create_order(order: Order):
+async def create_order(order: Order):
+    try:
+        # Keeps MENU_BY_ID current; a cache hit costs no DB round-trip
+        await _cached(_menu_cache, _menu_flight, _load_menu)
+    except Exception:
+        pass
+    if not MENU_INDEX_LOADED:
+        # The menu could not be read from the database (e.g. Mongo is down), so
+        # the items can't be checked; accept the order as demo mode did before
+        return {"id": None, "message": "Order received (demo mode). We'll start the grill!"}
+
+    # Menu items are named and priced from our own data rather than the
+    # client's; lines without an item_id are matched by their slugified name
+    items = []
+    for item in order.items:
+        key = item.item_id if item.item_id is not None else slugify(item.name)
+        menu_item = MENU_BY_ID.get(key)
+        if menu_item is not None:
+            item = item.model_copy(
+                update={"item_id": key, "name": menu_item["name"], "price": menu_item["price"]}
+            )
+        elif item.item_id is not None:
+            raise HTTPException(status_code=422, detail=f"Unknown menu item: {item.item_id}")
+        elif not ALLOW_CUSTOM_ITEMS:
+            raise HTTPException(status_code=422, detail=f"Unknown menu item: {item.name}")
+        items.append(item)
+    subtotal = round(sum(item.price * item.quantity for item in items), 2)
+    # With TAX_RATE configured, tax is derived from the trusted subtotal too;
+    # otherwise the client's (non-negative, schema-checked) tax is kept
+    tax = round(subtotal * TAX_RATE, 2) if TAX_RATE is not None else order.tax
+    order = order.model_copy(
+        update={"items": items, "subtotal": subtotal, "tax": tax, "total": round(subtotal + tax, 2)}
+    )
+
+    orders = getattr(app.state, "orders", None)
+    if orders is None:
+        return {"id": None, "message": "Order received (demo mode). We'll start the grill!"}
     try:
-        from database import create_document
-        order_id = create_document("order", order)
-        return {"id": order_id, "message": "Order received. We'll start the grill!"}
+        now = datetime.now(timezone.utc)
+        data = order.model_dump()
+        data["created_at"] = now
+        data["updated_at"] = now
+        # The ObjectId is generated client-side, so it is known even without an ack
+        result = await orders.insert_one(data)
+        return {"id": str(result.inserted_id), "message": "Order received. We'll start the grill!"}
     except Exception:
         # Accept order even without DB for demo purposes
         return {"id": None, "message": "Order received (demo mode). We'll start the grill!"}
@@ -171,4 +541,14 @@ def create_order(order: Order):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One worker per core by default; override with WEB_CONCURRENCY
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -11,8 +11,15 @@ Model name is converted to lowercase for the collection name:
 - BlogPost -> "blogs" collection
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+import re
+from annotated_types import Ge, Le
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Annotated, Optional, List
+
+
+def slugify(value: str) -> str:
+    """Lowercase, hyphen-separated form of a name, used as a stable ID"""
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
 
 # Example schemas (kept for reference):
 
@@ -24,7 +31,7 @@ class User(BaseModel):
     name: str = Field(..., description="Full name")
     email: str = Field(..., description="Email address")
     address: str = Field(..., description="Address")
-    age: Optional[int] = Field(None, ge=0, le=120, description="Age in years")
+    age: Optional[Annotated[int, Ge(0), Le(120)]] = Field(None, description="Age in years")
     is_active: bool = Field(True, description="Whether user is active")
 
 class Product(BaseModel):
@@ -34,42 +41,65 @@ class Product(BaseModel):
     """
     title: str = Field(..., description="Product title")
     description: Optional[str] = Field(None, description="Product description")
-    price: float = Field(..., ge=0, description="Price in dollars")
+    price: Annotated[float, Ge(0)] = Field(..., description="Price in dollars")
     category: str = Field(..., description="Product category")
     in_stock: bool = Field(True, description="Whether product is in stock")
 
 # App-specific schemas
 
+# Shared by the app models: extra keys (e.g. Mongo's created_at) are dropped,
+# instances are immutable, and defaults are trusted rather than re-validated.
+APP_MODEL_CONFIG = ConfigDict(
+    extra="ignore",
+    frozen=True,
+    str_strip_whitespace=False,
+    validate_default=False,
+)
+
 class MenuItem(BaseModel):
     """
     Menu items available to order
     Collection name: "menuitem"
     """
+    model_config = APP_MODEL_CONFIG
+
+    id: Optional[str] = Field(None, description="Stable ID, defaults to the slugified name")
     name: str = Field(..., description="Dish name")
     description: Optional[str] = Field(None, description="Short description")
-    price: float = Field(..., ge=0, description="Price in dollars")
+    price: Annotated[float, Ge(0)] = Field(..., description="Price in dollars")
     category: str = Field(..., description="Category, e.g., wraps, skewers, fries")
     image: Optional[str] = Field(None, description="Image or video thumbnail URL")
     media: Optional[str] = Field(None, description="Optional video loop URL")
-    rating: float = Field(4.8, ge=0, le=5, description="Average rating")
-    ratings_count: int = Field(0, ge=0, description="Number of ratings")
+    rating: Annotated[float, Ge(0), Le(5)] = Field(4.8, description="Average rating")
+    ratings_count: Annotated[int, Ge(0)] = Field(0, description="Number of ratings")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_id(cls, data):
+        if isinstance(data, dict) and not data.get("id") and isinstance(data.get("name"), str):
+            data = {**data, "id": slugify(data["name"])}
+        return data
 
 class Review(BaseModel):
     """
     Customer reviews for social proof
     Collection name: "review"
     """
+    model_config = APP_MODEL_CONFIG
+
     name: str = Field(..., description="Reviewer name")
     avatar: Optional[str] = Field(None, description="Avatar image URL")
-    rating: int = Field(..., ge=1, le=5, description="Stars 1-5")
+    rating: Annotated[int, Ge(1), Le(5)] = Field(..., description="Stars 1-5")
     quote: str = Field(..., description="Short testimonial")
     platform: Optional[str] = Field(None, description="e.g., Google, Yelp")
 
 class OrderItem(BaseModel):
+    model_config = APP_MODEL_CONFIG
+
     item_id: Optional[str] = Field(None, description="ID of menu item if applicable")
     name: str
-    price: float
-    quantity: int = 1
+    price: Annotated[float, Ge(0)]
+    quantity: Annotated[int, Ge(1)] = 1
     options: Optional[dict] = None
 
 class Order(BaseModel):
@@ -77,9 +107,11 @@ class Order(BaseModel):
     Orders placed via configurator or menu
     Collection name: "order"
     """
+    model_config = APP_MODEL_CONFIG
+
     items: List[OrderItem]
     subtotal: float
-    tax: float
+    tax: Annotated[float, Ge(0)]
     total: float
     customer_name: Optional[str] = None
     customer_phone: Optional[str] = None